@@ -18,7 +18,10 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import itertools
+import json
 import threading
+import types
 
 
 # Dummy run name for the debugger.
@@ -29,34 +32,59 @@ import threading
 # the same logdir, replace this magic string with actual run names.
 DEFAULT_DEBUGGER_RUN_NAME = "__default_debugger_run__"
 
-
-def _execution_digest_to_json(execution_digest):
-    # TODO(cais): Use the .to_json() method when avaiable.
-    return {
-        "wall_time": execution_digest.wall_time,
-        "op_type": execution_digest.op_type,
-        "output_tensor_device_ids": list(
-            execution_digest.output_tensor_device_ids
-        ),
+# The run-to-tags mapping returned by `Runs()` is structurally constant in
+# this build, so it is built once at import time. The read-only mapping
+# proxies prevent accidental mutation by callers and make the template safe
+# to share across threads and multiplexer instances.
+_RUNS_TEMPLATE = types.MappingProxyType(
+    {
+        DEFAULT_DEBUGGER_RUN_NAME: types.MappingProxyType(
+            # TODO(cais): Add the semantically meaningful tag names such as
+            # 'execution_digests_book', 'alerts_book'
+            {"debugger-v2": ()}
+        )
     }
+)
+
+# Default interval between successive runs of the background task in
+# `run_in_background()`, in seconds.
+DEFAULT_RELOAD_INTERVAL_SEC = 30
 
 
-def run_in_background(target):
-    """Run a target task in the background.
+def run_in_background(target, interval_sec=DEFAULT_RELOAD_INTERVAL_SEC):
+    """Run a target task periodically in a background daemon thread.
 
     In the context of this module, `target` is the `update()` method of the
-    underlying reader for tfdbg2-format data.
+    underlying reader for tfdbg2-format data. Running it periodically keeps
+    the reader up to date with data still being written by the instrumented
+    program, instead of freezing the state at the time of the first request.
+    The thread is a daemon, so it does not block process exit.
+
     This method is mocked by unit tests for deterministic behaviors during
     testing.
 
     Args:
-      target: The target task to run in the background, a callable with no args.
+      target: The target task to run in the background, a callable with no
+        args.
+      interval_sec: Time interval between successive runs of `target`, in
+        seconds.
+
+    Returns:
+      A tuple of `(thread, stop_event)`:
+        thread: The daemon `threading.Thread` that the task runs on.
+        stop_event: A `threading.Event` that ends the repetition when set.
+          Setting it during a waiting interval also cuts the interval short.
     """
-    # TODO(cais): Implement repetition with sleeping periods in between.
-    # TODO(cais): Add more unit tests in debug_data_multiplexer_test.py when the
-    # the behavior gets more complex.
-    thread = threading.Thread(target=target)
+    stop_event = threading.Event()
+
+    def _run_repeatedly():
+        while not stop_event.is_set():
+            target()
+            stop_event.wait(interval_sec)
+
+    thread = threading.Thread(target=_run_repeatedly, daemon=True)
     thread.start()
+    return thread, stop_event
 
 
 class DebuggerV2EventMultiplexer(object):
@@ -79,6 +107,35 @@ class DebuggerV2EventMultiplexer(object):
         """
         self._logdir = logdir
         self._reader = None
+        # Guards the lazy construction of `self._reader` in `Runs()`, so that
+        # concurrent request-handler threads cannot create duplicate readers
+        # (and duplicate background update threads) for the same logdir.
+        self._reader_lock = threading.Lock()
+        # The background thread that periodically updates the reader, and the
+        # event used to stop it. See `run_in_background()`.
+        self._update_thread = None
+        self._update_stop_event = None
+        # Memoized return value of `Runs()`: set to `_RUNS_TEMPLATE` on the
+        # first successful construction of the underlying reader, so that the
+        # polling UI does not cause a fresh dict to be allocated per request.
+        # Must be reset to `None` if `self._reader` is ever reset.
+        self._runs_cache = None
+        # Cached result of the reader's `executions(digest=True)` call, so
+        # that consecutive pagination requests share one materialization of
+        # the digest collection. See `_execution_digests()`.
+        self._execution_digests_cache = None
+        # Cached snapshot of the reader's source-file list, together with the
+        # version of the reader's source-file mapping that the snapshot was
+        # taken at. See `_source_file_list()`.
+        self._source_files_cache = None
+        self._source_files_version = -1
+
+    def __del__(self):
+        # Signal the background update thread (if one has been started) to
+        # stop, so that the periodic reloading does not outlive this
+        # multiplexer.
+        if self._update_stop_event is not None:
+            self._update_stop_event.set()
 
     def FirstEventTimestamp(self, run):
         """Return the timestamp of the first DebugEvent of the given run.
@@ -104,6 +161,116 @@ class DebuggerV2EventMultiplexer(object):
             )
         return self._reader.starting_wall_time()
 
+    def _num_executions(self):
+        """Get the number of executions read so far, without the digests.
+
+        Returns:
+          The number of executions ingested by the reader so far, obtained via
+          a cheap metadata query that does not materialize the digest
+          collection; `None` if the reader is an older version of
+          `DebugDataReader` that lacks `num_executions()`.
+        """
+        try:
+            return self._reader.num_executions()
+        except AttributeError:
+            return None
+
+    def _execution_digests(self):
+        """Get the list of all `ExecutionDigest`s, with caching.
+
+        The underlying reader's `executions()` method materializes the entire
+        digest collection on every call, which is O(N) work per request even
+        when the caller only needs a small pagination window. Cache the
+        returned list and rebuild it only when the background reader has
+        ingested new executions, so that consecutive pagination requests share
+        a single materialization.
+
+        Returns:
+          A list of `ExecutionDigest`s for all executions read so far.
+        """
+        num_executions = self._num_executions()
+        if (
+            num_executions is None
+            or self._execution_digests_cache is None
+            or len(self._execution_digests_cache) != num_executions
+        ):
+            # TODO(cais): For scalability, use begin and end kwargs when
+            # available in `DebugDataReader.executions()`, instead of
+            # materializing the full digest collection here.
+            self._execution_digests_cache = self._reader.executions(digest=True)
+        return self._execution_digests_cache
+
+    def _source_file_list(self):
+        """Get the list of source files involved in the run, with caching.
+
+        Rebuilding the key list of the reader's source-file mapping on every
+        request is an O(F) allocation (F being the number of source files),
+        even when only a single element is needed. Snapshot the keys as a
+        tuple, which supports O(1) random access and is safe to share with
+        callers, and rebuild the snapshot only when the size of the underlying
+        mapping (a cheap proxy for its version) has changed.
+
+        Returns:
+          A tuple of `(host_name, file_path)` tuples.
+        """
+        # TODO(cais): Use public method `self._reader.source_files()` when
+        # available.
+        # pylint: disable=protected-access
+        offsets = self._reader._host_name_file_path_to_offset
+        # pylint: enable=protected-access
+        version = len(offsets)
+        if (
+            self._source_files_cache is None
+            or version != self._source_files_version
+        ):
+            self._source_files_cache = tuple(offsets)
+            self._source_files_version = version
+        return self._source_files_cache
+
+    def _source_file_at(self, index):
+        """Get the `(host_name, file_path)` of the source file at `index`.
+
+        In the steady state this is a single O(1) index into the cached
+        snapshot from `_source_file_list()`. When the snapshot is stale, the
+        requested entry is pulled directly from the reader's mapping with
+        `islice`, so a single-element lookup does not pay for a full O(F)
+        snapshot rebuild.
+
+        Args:
+          index: Index of the source file in the source-file list.
+
+        Returns:
+          A `(host_name, file_path)` tuple.
+
+        Raises:
+          IndexError: If `index` is negative or out of bounds.
+        """
+        if index < 0:
+            # Negative indices are rejected up front: `islice` on the stale
+            # path below cannot handle them, and accepting them only on the
+            # cached path would make the behavior of a request depend on
+            # whether the snapshot happens to be fresh.
+            raise IndexError("There is no source-code file at index %d" % index)
+        # TODO(cais): Use public method `self._reader.source_files()` when
+        # available.
+        # pylint: disable=protected-access
+        offsets = self._reader._host_name_file_path_to_offset
+        # pylint: enable=protected-access
+        cache = self._source_files_cache
+        if cache is not None and self._source_files_version == len(offsets):
+            try:
+                return cache[index]
+            except IndexError:
+                raise IndexError(
+                    "There is no source-code file at index %d" % index
+                )
+        try:
+            # Iterating the mapping yields its keys directly; `islice` skips
+            # to the requested entry without building the full key list.
+            return next(itertools.islice(offsets, index, index + 1))
+        except StopIteration:
+            raise IndexError("There is no source-code file at index %d" % index)
+
     def PluginRunToTagToContent(self, plugin_name):
         raise NotImplementedError(
             "DebugDataMultiplexer.PluginRunToTagToContent() has not been "
@@ -117,46 +284,56 @@ class DebuggerV2EventMultiplexer(object):
         DebugEvent files. It only returns runs
 
         Returns:
-        If tfdbg2-format data exists in the `logdir` of this object, returns:
+        If tfdbg2-format data exists in the `logdir` of this object, returns
+            a read-only mapping (`types.MappingProxyType`) of the form:
             ```
-            {runName: { "debugger-v2": [tag1, tag2, tag3] } }
+            {runName: { "debugger-v2": (tag1, tag2, tag3) } }
             ```
             where `runName` is the hard-coded string `DEFAULT_DEBUGGER_RUN_NAME`
             string. This is related to the fact that tfdbg2 currently contains
-            at most one DebugEvent file set per directory.
+            at most one DebugEvent file set per directory. The mapping is
+            shared across calls and threads and must not be mutated by the
+            caller.
         If no tfdbg2-format data exists in the `logdir`, an empty `dict`.
         """
         if self._reader is None:
-            from tensorflow.python.debug.lib import debug_events_reader
+            with self._reader_lock:
+                # Double-checked locking: another thread may have constructed
+                # the reader while this one was waiting for the lock.
+                if self._reader is None:
+                    from tensorflow.python.debug.lib import debug_events_reader
 
-            try:
-                self._reader = debug_events_reader.DebugDataReader(self._logdir)
-                # NOTE(cais): Currently each logdir is enforced to have only one
-                # DebugEvent file set. So we add hard-coded default run name.
-                run_in_background(self._reader.update)
-                # TODO(cais): Start off a reading thread here, instead of being
-                # called only once here.
-            except AttributeError as error:
-                # Gracefully fail for users without the required API changes to
-                # debug_events_reader.DebugDataReader introduced in
-                # TF 2.1.0.dev20200103. This should be safe to remove when
-                # TF 2.2 is released.
-                return {}
-            except ValueError as error:
-                # When no DebugEvent file set is found in the logdir, a
-                # `ValueError` is thrown.
-                return {}
+                    try:
+                        reader = debug_events_reader.DebugDataReader(
+                            self._logdir
+                        )
+                        # NOTE(cais): Currently each logdir is enforced to have
+                        # only one DebugEvent file set. So we add hard-coded
+                        # default run name.
+                        (
+                            self._update_thread,
+                            self._update_stop_event,
+                        ) = run_in_background(reader.update)
+                    except AttributeError as error:
+                        # Gracefully fail for users without the required API
+                        # changes to debug_events_reader.DebugDataReader
+                        # introduced in TF 2.1.0.dev20200103. This should be
+                        # safe to remove when TF 2.2 is released.
+                        return {}
+                    except ValueError as error:
+                        # When no DebugEvent file set is found in the logdir, a
+                        # `ValueError` is thrown.
+                        return {}
+                    self._runs_cache = _RUNS_TEMPLATE
+                    # Publish the reader last, so that threads reading
+                    # `self._reader` without the lock never observe a reader
+                    # whose background update has not been started yet.
+                    self._reader = reader
 
-        return {
-            DEFAULT_DEBUGGER_RUN_NAME: {
-                # TODO(cais): Add the semantically meaningful tag names such as
-                # 'execution_digests_book', 'alerts_book'
-                "debugger-v2": []
-            }
-        }
+        return self._runs_cache or {}
 
-    def ExecutionDigests(self, run, begin, end):
-        """Get ExecutionDigests.
+    def _execution_digest_range(self, run, begin, end):
+        """Resolve and validate a requested range of execution digests.
 
         Args:
           run: The tfdbg2 run to get `ExecutionDigest`s from.
@@ -164,21 +341,34 @@ class DebuggerV2EventMultiplexer(object):
           end: Ending execution index.
 
         Returns:
-          A JSON-serializable object containing the `ExecutionDigest`s and
-          related meta-information
+          `None` if `run` is not a valid tfdbg2 run. Otherwise, a tuple of
+          `(begin, end, num_digests, digests_slice)`, where `end` has been
+          resolved against the current execution count and `digests_slice` is
+          an iterable over the requested window of `ExecutionDigest`s.
+
+        Raises:
+          IndexError: If `begin` or `end` is out of bounds.
+          ValueError: If `end` is non-negative and less than `begin`.
         """
-        runs = self.Runs()
-        if run not in runs:
+        self.Runs()  # Ensure the reader is initialized (lazily).
+        if run != DEFAULT_DEBUGGER_RUN_NAME or self._runs_cache is None:
             return None
-        # TODO(cais): For scalability, use begin and end kwargs when available in
-        # `DebugDataReader.execution()`.`
-        execution_digests = self._reader.executions(digest=True)
+        # Validate the requested range against the execution count before
+        # materializing any digests, so that malformed requests do not pay
+        # the cost of an O(N) fetch.
+        execution_digests = None
+        num_digests = self._num_executions()
+        if num_digests is None:
+            # Reader without the cheap metadata query: the digests must be
+            # materialized to learn the count. Hold on to the fetched list so
+            # that the slice below does not fetch it a second time.
+            execution_digests = self._execution_digests()
+            num_digests = len(execution_digests)
         if begin < 0:
             raise IndexError("Invalid begin index (%d)" % begin)
-        if end > len(execution_digests):
+        if end > num_digests:
             raise IndexError(
-                "end index (%d) out of bounds (%d)"
-                % (end, len(execution_digests))
+                "end index (%d) out of bounds (%d)" % (end, num_digests)
             )
         if end >= 0 and end < begin:
             raise ValueError(
@@ -186,40 +376,127 @@ class DebuggerV2EventMultiplexer(object):
                 % (end, begin)
             )
         if end < 0:  # This means all digests.
-            end = len(execution_digests)
+            end = num_digests
+        if end == begin:
+            # Short-circuit empty ranges without touching the digest buffer.
+            digests_slice = ()
+        else:
+            if execution_digests is None:
+                execution_digests = self._execution_digests()
+            # `islice` iterates the requested window directly, without
+            # allocating an intermediate list for the slice.
+            digests_slice = itertools.islice(execution_digests, begin, end)
+        return begin, end, num_digests, digests_slice
+
+    def _execution_digest_dicts(self, digests):
+        """Convert `ExecutionDigest`s to JSON-serializable dicts, lazily.
+
+        One dict is yielded per digest, so callers that consume the dicts
+        incrementally (e.g., `SerializedExecutionDigests()`) never hold more
+        than one converted dict alive at a time.
+
+        Args:
+          digests: An iterable of `ExecutionDigest`s.
+
+        Yields:
+          A JSON-serializable dict for each digest, in order.
+        """
+        # TODO(cais): Use the .to_json() method when avaiable.
+        # `list` is bound to a local to skip the builtin lookup on each
+        # iteration.
+        _list = list
+        for digest in digests:
+            yield {
+                "wall_time": digest.wall_time,
+                "op_type": digest.op_type,
+                "output_tensor_device_ids": _list(
+                    digest.output_tensor_device_ids
+                ),
+            }
+
+    def ExecutionDigests(self, run, begin, end):
+        """Get ExecutionDigests.
+
+        Args:
+          run: The tfdbg2 run to get `ExecutionDigest`s from.
+          begin: Beginning execution index.
+          end: Ending execution index.
+
+        Returns:
+          A JSON-serializable object containing the `ExecutionDigest`s and
+          related meta-information
+        """
+        digest_range = self._execution_digest_range(run, begin, end)
+        if digest_range is None:
+            return None
+        begin, end, num_digests, digests_slice = digest_range
         return {
             "begin": begin,
             "end": end,
-            "num_digests": len(execution_digests),
-            "execution_digests": [
-                _execution_digest_to_json(digest)
-                for digest in execution_digests[begin:end]
-            ],
+            "num_digests": num_digests,
+            "execution_digests": list(
+                self._execution_digest_dicts(digests_slice)
+            ),
         }
 
+    def SerializedExecutionDigests(self, run, begin, end):
+        """Like `ExecutionDigests()`, but returns a pre-serialized JSON string.
+
+        Serializing here, instead of returning a dict for the caller to pass
+        through `json.dumps()`, avoids building a response-sized list of
+        per-digest dicts: each dict is created, encoded and released as the
+        requested window is iterated. The encoded string fragments (and the
+        returned string itself) still scale with `end - begin`, as any
+        whole-string response must.
+
+        Args:
+          run: The tfdbg2 run to get `ExecutionDigest`s from.
+          begin: Beginning execution index.
+          end: Ending execution index.
+
+        Returns:
+          A JSON string carrying the same payload that `ExecutionDigests()`
+          returns as a dict; the JSON value `"null"` if `run` is not a valid
+          tfdbg2 run.
+
+        Raises:
+          IndexError: If `begin` or `end` is out of bounds.
+          ValueError: If `end` is non-negative and less than `begin`.
+        """
+        digest_range = self._execution_digest_range(run, begin, end)
+        if digest_range is None:
+            return json.dumps(None)
+        begin, end, num_digests, digests_slice = digest_range
+        encode = json.JSONEncoder().encode
+        digests_json = ", ".join(
+            encode(digest_dict)
+            for digest_dict in self._execution_digest_dicts(digests_slice)
+        )
+        # Encode the envelope with the digest array left empty, then splice
+        # the separately encoded digests into it, so that all JSON content
+        # comes from the encoder.
+        envelope = encode(
+            {
+                "begin": begin,
+                "end": end,
+                "num_digests": num_digests,
+                "execution_digests": (),
+            }
+        )
+        # `envelope` ends with the empty `"execution_digests"` array: '[]}'.
+        return "%s%s]}" % (envelope[: -len("]}")], digests_json)
+
     def SourceFileList(self, run):
-        runs = self.Runs()
-        if run not in runs:
+        self.Runs()  # Ensure the reader is initialized (lazily).
+        if run != DEFAULT_DEBUGGER_RUN_NAME or self._runs_cache is None:
             return None
-        # TODO(cais): Use public method `self._reader.source_files()` when available.
-        # pylint: disable=protected-access
-        return list(self._reader._host_name_file_path_to_offset.keys())
-        # pylint: enable=protected-access
+        return self._source_file_list()
 
     def SourceLines(self, run, index):
-        runs = self.Runs()
-        if run not in runs:
+        self.Runs()  # Ensure the reader is initialized (lazily).
+        if run != DEFAULT_DEBUGGER_RUN_NAME or self._runs_cache is None:
             return None
-        # TODO(cais): Use public method `self._reader.source_files()` when available.
-        # pylint: disable=protected-access
-        source_file_list = list(
-            self._reader._host_name_file_path_to_offset.keys()
-        )
-        # pylint: enable=protected-access
-        try:
-            host_name, file_path = source_file_list[index]
-        except IndexError:
-            raise IndexError("There is no source-code file at index %d" % index)
+        host_name, file_path = self._source_file_at(index)
         return {
             "host_name": host_name,
             "file_path": file_path,
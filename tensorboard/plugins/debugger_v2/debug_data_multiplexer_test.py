@@ -23,22 +23,26 @@ import tensorflow as tf
 from tensorboard.plugins.debugger_v2 import debug_data_multiplexer
 
 
-class MockThread(object):
-    """A mock for threading.Thread for testing."""
-
-    def __init__(self, target):
-        self._target = target
-
-    def start(self):
-        self._target()
-
-
 class DebuggerV2PluginTest(tf.test.TestCase):
-    def testRunInBackground(self):
-        mock_target = tf.compat.v1.test.mock.Mock()
-        with tf.compat.v1.test.mock.patch("threading.Thread", MockThread):
-            debug_data_multiplexer.run_in_background(mock_target)
-            mock_target.assert_called_once()
+    def testRunInBackgroundRepeatsTargetUntilStopped(self):
+        state = {"call_count": 0}
+        called_twice = threading.Event()
+
+        def target():
+            state["call_count"] += 1
+            if state["call_count"] >= 2:
+                called_twice.set()
+
+        thread, stop_event = debug_data_multiplexer.run_in_background(
+            target, interval_sec=0.01
+        )
+        self.assertTrue(thread.daemon)
+        # Use a generous timeout, so that a regression in the repetition
+        # fails the test instead of hanging the test suite.
+        self.assertTrue(called_twice.wait(60))
+        stop_event.set()
+        thread.join()
+        self.assertGreaterEqual(state["call_count"], 2)
 
 
 if __name__ == "__main__":
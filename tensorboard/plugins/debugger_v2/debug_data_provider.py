@@ -230,9 +230,10 @@ class LocalDebuggerV2DataProvider(provider.DataProvider):
     def read_blob(self, blob_key):
         if blob_key.startswith(EXECUTION_DIGESTS_BLOB_TAG_PREFIX):
             run, begin, end = _parse_execution_digest_blob_key(blob_key)
-            return json.dumps(
-                self._multiplexer.ExecutionDigests(run, begin, end)
-            )
+            # The multiplexer serializes the digests incrementally, so that
+            # peak memory does not scale with an intermediate list of dicts
+            # for the full response.
+            return self._multiplexer.SerializedExecutionDigests(run, begin, end)
         elif blob_key.startswith(SOURCE_FILE_LIST_BLOB_TAG):
             run = _parse_source_file_list_blob_key(blob_key)
             return json.dumps(self._multiplexer.SourceFileList(run))
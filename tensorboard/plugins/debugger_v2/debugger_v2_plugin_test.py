@@ -21,6 +21,7 @@ from __future__ import print_function
 import json
 import os
 import socket
+import threading
 
 import tensorflow as tf
 from werkzeug import test as werkzeug_test  # pylint: disable=wrong-import-order
@@ -101,8 +102,10 @@ class DebuggerV2PluginTest(tf.test.TestCase):
         # unit test, we disable the asynchronous behavior, so that we can
         # load the debugger data synchronously on the main thread and get
         # determinisic behavior in the tests.
-        def run_in_background_mock(target):
+        def run_in_background_mock(target, interval_sec=None):
+            del interval_sec  # Unused: the target is run only once, eagerly.
             target()
+            return None, threading.Event()
 
         self.run_in_background_patch = tf.compat.v1.test.mock.patch.object(
             debug_data_multiplexer, "run_in_background", run_in_background_mock